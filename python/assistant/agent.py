@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from assistant.config import CONFIG
 from assistant.openai_compat_client import OpenAICompatClient
 from memory.sqlite_store import SqliteMemoryStore
+from util import json_utils
 from util.logging_utils import log
 
 
@@ -22,6 +22,12 @@ class SimpleAgent:
         self._memory_store = SqliteMemoryStore()
         self._tools: Dict[str, ToolFunc] = {}
         self._tool_schemas: List[Dict[str, Any]] = []
+        # (preferences version, assembled system prompt)
+        self._system_cache: Optional[Tuple[int, str]] = None
+
+    @property
+    def memory_store(self) -> SqliteMemoryStore:
+        return self._memory_store
 
     def set_tools(self, tool_schemas: List[Dict[str, Any]], tool_fns: Dict[str, ToolFunc]) -> None:
         self._tool_schemas = tool_schemas
@@ -36,8 +42,8 @@ class SimpleAgent:
         name = fn.get("name") or ""
         args_raw = fn.get("arguments") or "{}"
         try:
-            args = json.loads(args_raw) if isinstance(args_raw, str) else (args_raw or {})
-        except json.JSONDecodeError:
+            args = json_utils.loads(args_raw) if isinstance(args_raw, (str, bytes)) else (args_raw or {})
+        except json_utils.JSONDecodeError:
             return tool_id, f"Error: invalid JSON arguments for tool '{name}'."
 
         tool_fn = self._tools.get(name)
@@ -49,9 +55,29 @@ class SimpleAgent:
         except Exception as e:  # noqa: BLE001
             return tool_id, f"Error executing tool '{name}': {e}"
 
-    def run(self, user_text: str) -> str:
+    def _system_prompt(self) -> str:
+        """
+        CONFIG.system_prompt plus saved preferences, rebuilt only after a
+        preference has changed.
+        """
+        version = self._memory_store.get_preferences_version()
+        if self._system_cache is not None and self._system_cache[0] == version:
+            return self._system_cache[1]
+
+        prefs = self._memory_store.get_preferences()
+        system = CONFIG.system_prompt
+        if prefs:
+            lines = "\n".join(f"- {k}: {v}" for k, v in sorted(prefs.items()))
+            system = f"{system}\n\nUserPreferences:\n{lines}"
+        self._system_cache = (version, system)
+        return system
+
+    def run(self, user_text: str, on_token: Optional[Callable[[str], None]] = None) -> str:
         """
-        Synchronous, non-streaming agent loop with optional tool-calling.
+        Synchronous agent loop with optional tool-calling.
+
+        If `on_token` is given (and LLM_STREAM=1), completions
+        are streamed and each content delta is passed to it as it arrives.
         """
         user_text = (user_text or "").strip()
         if not user_text:
@@ -62,17 +88,14 @@ class SimpleAgent:
 
         messages = [*history, {"role": "user", "content": user_text}]
 
-        prefs = self._memory_store.get_preferences()
-        system = CONFIG.system_prompt
-        if prefs:
-            lines = "\n".join(f"- {k}: {v}" for k, v in prefs.items())
-            system = f"{system}\n\nUserPreferences:\n{lines}"
+        system = self._system_prompt()
 
         for _ in range(max(0, CONFIG.max_tool_loops)):
             result = self._client.chat_completion(
                 messages=messages,
                 system=system,
                 tools=self._tool_schemas or None,
+                on_token=on_token if CONFIG.llm_stream else None,
             )
 
             if result.content:
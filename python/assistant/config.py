@@ -7,6 +7,9 @@ class AssistantConfig:
     llm_base_url: str = os.getenv("LLM_BASE_URL", "http://127.0.0.1:1234/v1").rstrip("/")
     llm_model: str = os.getenv("LLM_MODEL", "meta-llama-3-8b-instruct")
     llm_temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+    # Stream completions so partial text reaches the client before the turn
+    # ends. Opt-in: the Electron UI does not render `assistant_partial` yet.
+    llm_stream: bool = os.getenv("LLM_STREAM", "0") == "1"
     max_tool_loops: int = int(os.getenv("LLM_MAX_TOOL_LOOPS", "4"))
     max_context_messages: int = int(os.getenv("ASSISTANT_MAX_CONTEXT_MESSAGES", "24"))
     system_prompt: str = os.getenv(
@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-import json
-import urllib.error
+import asyncio
+import http.client
+import threading
 import urllib.request
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from util import json_utils
+
+try:
+    import aiohttp
+except ImportError:  # optional: check_health_async falls back to a thread
+    aiohttp = None
 
 
 @dataclass
@@ -13,11 +22,45 @@ class ChatResult:
     tool_calls: List[Dict[str, Any]]
 
 
+class _StreamCollector:
+    """Forwards streamed content deltas to `on_token` and merges everything into a ChatResult."""
+
+    def __init__(self, on_token: Callable[[str], None]) -> None:
+        self._on_token = on_token
+        self._content_parts: List[str] = []
+        self._calls: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, delta: Dict[str, Any]) -> None:
+        text = delta.get("content")
+        if text:
+            self._content_parts.append(text)
+            self._on_token(text)
+        for tc in delta.get("tool_calls") or []:
+            call = self._calls.setdefault(
+                int(tc.get("index") or 0),
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if tc.get("id"):
+                call["id"] = tc["id"]
+            fn = tc.get("function") or {}
+            if fn.get("name"):
+                call["function"]["name"] += fn["name"]
+            if fn.get("arguments"):
+                call["function"]["arguments"] += fn["arguments"]
+
+    def result(self) -> ChatResult:
+        tool_calls = [self._calls[i] for i in sorted(self._calls)]
+        return ChatResult(content="".join(self._content_parts), tool_calls=tool_calls)
+
+
 class OpenAICompatClient:
     """
-    Minimal OpenAI-compatible /v1/chat/completions client using stdlib only.
+    Minimal OpenAI-compatible /v1/chat/completions client using stdlib only
+    (orjson is used for (de)serialization when installed, aiohttp for the
+    async health check).
 
-    Works with LM Studio's local server.
+    Works with LM Studio's local server. Chat requests reuse one keep-alive
+    connection, so agent turns and tool loops don't pay a TCP setup each.
     """
 
     def __init__(self, base_url: str, model: str, temperature: float = 0.7) -> None:
@@ -25,6 +68,82 @@ class OpenAICompatClient:
         self._model = model
         self._temperature = temperature
 
+        parts = urlsplit(self._base_url)
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port
+        self._path_prefix = parts.path.rstrip("/")
+        self._conn: Optional[http.client.HTTPConnection] = None
+        # Reentrant: held while encoding a body and again while sending it.
+        self._conn_lock = threading.RLock()
+        # Created on first check_health_async(), inside the running loop, and
+        # recreated if a later call runs on a different loop.
+        self._health_session: Any = None
+        self._health_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._msg_buf: List[Dict[str, Any]] = []
+        self._system_msg: Optional[Dict[str, str]] = None
+        self._body: Dict[str, Any] = {
+            "model": self._model,
+            "messages": self._msg_buf,
+            "temperature": self._temperature,
+            "stream": False,
+        }
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        if self._conn is None:
+            conn_cls = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            self._conn = conn_cls(self._host, self._port, timeout=timeout)
+        return self._conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _send_once(self, path: str, body: bytes, timeout: float) -> http.client.HTTPResponse:
+        conn = self._connection(timeout)
+        try:
+            conn.request(
+                "POST",
+                f"{self._path_prefix}{path}",
+                body=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept-Encoding": "identity",
+                    "Connection": "keep-alive",
+                },
+            )
+            return conn.getresponse()
+        except Exception:
+            self._close_connection()
+            raise
+
+    def _send(self, path: str, body: bytes, timeout: float) -> http.client.HTTPResponse:
+        """
+        POST on the persistent connection. The caller must hold _conn_lock
+        and either read the response to the end or close the connection.
+        """
+        try:
+            return self._send_once(path, body, timeout)
+        except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+            # The server dropped the idle keep-alive connection
+            # (RemoteDisconnected is both); reconnect once.
+            return self._send_once(path, body, timeout)
+
+    def _post(self, path: str, body: bytes, timeout: float = 60) -> Tuple[int, str, bytes]:
+        """POST on the persistent connection; returns (status, reason, body)."""
+        with self._conn_lock:
+            resp = self._send(path, body, timeout)
+            try:
+                data = resp.read()
+            except Exception:
+                self._close_connection()
+                raise
+            if resp.will_close:
+                self._close_connection()
+            return resp.status, resp.reason, data
+
     def check_health(self, timeout: float = 3.0) -> bool:
         """
         Check if the LLM server is reachable and responding.
@@ -40,48 +159,105 @@ class OpenAICompatClient:
         except Exception:
             return False
 
+    async def check_health_async(self, timeout: float = 3.0) -> bool:
+        """
+        check_health() for the event loop: polls share one pooled aiohttp
+        session (no thread hop, no new connection per poll). Falls back to
+        check_health() in a worker thread if aiohttp isn't installed.
+        """
+        if aiohttp is None:
+            return await asyncio.to_thread(self.check_health, timeout)
+
+        try:
+            loop = asyncio.get_running_loop()
+            session = self._health_session
+            if session is None or session.closed or self._health_loop is not loop:
+                # A session is bound to the loop that created it; one left
+                # over from a previous loop can't be used (or closed) here.
+                self._health_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                )
+                self._health_loop = loop
+            async with self._health_session.get(
+                f"{self._base_url}/models",
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                return resp.status == 200
+        except Exception:
+            return False
+
+    async def aclose(self) -> None:
+        """Close the health-check session, if one was opened."""
+        session, self._health_session = self._health_session, None
+        loop, self._health_loop = self._health_loop, None
+        if session is not None and loop is asyncio.get_running_loop():
+            await session.close()
+
+    def _encode_body(
+        self,
+        messages: List[Dict[str, Any]],
+        system: Optional[str],
+        tools: Optional[List[Dict[str, Any]]],
+        stream: bool,
+    ) -> bytes:
+        """
+        Serialize a request using the persistent body template: the body dict,
+        the system message and the system-prefixed message list are reused
+        across calls (up to max_tool_loops per turn) rather than rebuilt.
+        """
+        with self._conn_lock:
+            body = self._body
+            msg_buf = self._msg_buf
+            if system:
+                if self._system_msg is None or self._system_msg["content"] != system:
+                    self._system_msg = {"role": "system", "content": system}
+                msg_buf.append(self._system_msg)
+            msg_buf.extend(messages)
+            body["stream"] = stream
+            if tools:
+                body["tools"] = tools
+            try:
+                return json_utils.dumps(body)
+            finally:
+                # Don't keep the caller's history alive between calls.
+                msg_buf.clear()
+                body.pop("tools", None)
+
     def chat_completion(
         self,
         *,
         messages: List[Dict[str, Any]],
         system: Optional[str] = None,
         tools: Optional[List[Dict[str, Any]]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> ChatResult:
-        url = f"{self._base_url}/chat/completions"
-
-        messages_with_system = messages
-        if system:
-            messages_with_system = [{"role": "system", "content": system}, *messages]
-
-        body: Dict[str, Any] = {
-            "model": self._model,
-            "messages": messages_with_system,
-            "temperature": self._temperature,
-            "stream": False,
-        }
-        if tools:
-            body["tools"] = tools
-
-        req = urllib.request.Request(
-            url,
-            data=json.dumps(body).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+        """
+        Run one completion. With `on_token`, the response is streamed and
+        each content delta is passed to it as it arrives; the returned
+        ChatResult is the same either way.
+        """
+        if on_token is not None:
+            stream = _StreamCollector(on_token)
+            self.chat_completion_stream(messages=messages, system=system, tools=tools, on_delta=stream.add)
+            result = stream.result()
+            if not result.content and not result.tool_calls:
+                raise RuntimeError("LLM returned no choices (empty stream)")
+            return result
 
+        body = self._encode_body(messages, system, tools, stream=False)
         try:
-            with urllib.request.urlopen(req, timeout=60) as resp:
-                raw = resp.read().decode("utf-8", errors="replace")
-        except urllib.error.HTTPError as e:
-            detail = e.read().decode("utf-8", errors="replace") if getattr(e, "fp", None) else str(e)
-            raise RuntimeError(f"LLM HTTP error: {e.code} {e.reason}: {detail}") from e
+            status, reason, raw = self._post("/chat/completions", body)
         except Exception as e:  # noqa: BLE001
             raise RuntimeError(f"LLM connection error: {e}") from e
+        if status >= 400:
+            detail = raw.decode("utf-8", errors="replace")
+            raise RuntimeError(f"LLM HTTP error: {status} {reason}: {detail}")
 
         try:
-            payload = json.loads(raw)
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"LLM returned non-JSON response: {raw[:500]}") from e
+            payload = json_utils.loads(raw)
+        except json_utils.JSONDecodeError as e:
+            preview = raw[:500].decode("utf-8", errors="replace")
+            raise RuntimeError(f"LLM returned non-JSON response: {preview}") from e
 
         choices = payload.get("choices") or []
         if not choices:
@@ -95,4 +271,58 @@ class OpenAICompatClient:
 
         return ChatResult(content=str(content), tool_calls=tool_calls)
 
+    def chat_completion_stream(
+        self,
+        *,
+        messages: List[Dict[str, Any]],
+        system: Optional[str] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        on_delta: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        """
+        Streaming (`"stream": true`) completion. Calls `on_delta` with the
+        first choice's `delta` dict from each SSE `data:` event, i.e. partial
+        `content` and/or partial `tool_calls`, as soon as it arrives.
+
+        The whole response is read (and `on_delta` called) while holding the
+        shared connection, so it is always released on return; if `on_delta`
+        raises, the half-read connection is dropped.
+        """
+        body = self._encode_body(messages, system, tools, stream=True)
+        with self._conn_lock:
+            try:
+                resp = self._send("/chat/completions", body, 60)
+            except Exception as e:  # noqa: BLE001
+                raise RuntimeError(f"LLM connection error: {e}") from e
+
+            # Only a fully read response leaves the connection reusable.
+            drained = False
+            try:
+                if resp.status >= 400:
+                    detail = resp.read().decode("utf-8", errors="replace")
+                    drained = True
+                    raise RuntimeError(f"LLM HTTP error: {resp.status} {resp.reason}: {detail}")
 
+                try:
+                    for line in resp:
+                        if not line.startswith(b"data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == b"[DONE]":
+                            break
+                        try:
+                            chunk = json_utils.loads(data)
+                        except json_utils.JSONDecodeError as e:
+                            preview = data[:500].decode("utf-8", errors="replace")
+                            raise RuntimeError(f"LLM returned non-JSON stream event: {preview}") from e
+                        choices = chunk.get("choices") or []
+                        delta = (choices[0] or {}).get("delta") if choices else None
+                        if delta:
+                            on_delta(delta)
+                    resp.read()
+                    drained = True
+                except (OSError, http.client.HTTPException) as e:
+                    raise RuntimeError(f"LLM connection error: {e}") from e
+            finally:
+                if not drained or resp.will_close:
+                    self._close_connection()
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import itertools
 import os
+import queue
 import sqlite3
 import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from util.logging_utils import log
+
+
+# Writer thread group-commit limits: a batch closes after this many
+# statements or this long after its first statement, whichever comes first.
+_WRITE_BATCH_MAX = 64
+_WRITE_BATCH_WINDOW_S = 0.02
+
+# How long set_preference waits for its commit: the connection's default 5 s
+# busy timeout plus headroom for a backlog of queued writes.
+_PREF_WRITE_TIMEOUT_S = 10.0
 
 
 def _default_db_path() -> str:
@@ -26,7 +41,12 @@ class SqliteMemoryStore:
     """
     Durable memory store for conversation history + preferences.
 
-    Uses a single sqlite DB file on disk.
+    Uses a single sqlite DB file on disk. Writes are enqueued and applied by
+    a background thread on its own connection, coalesced into one
+    transaction per batch (a failing batch is replayed statement by
+    statement, so one bad row only loses itself); reads use the foreground
+    connection and first wait for pending writes so they always see them.
+    set_preference() waits for its own commit. Call flush() before shutdown.
     """
 
     def __init__(self, db_path: Optional[str] = None) -> None:
@@ -34,7 +54,41 @@ class SqliteMemoryStore:
         self._lock = threading.Lock()
         self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._configure_pragmas(self._conn)
         self._init_schema()
+        # In-process mirror of the preferences table; this store is its only
+        # writer, so reads never need to hit SQLite.
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM preferences;").fetchall()
+        self._prefs_cache: Dict[str, str] = {str(r["key"]): str(r["value"]) for r in rows}
+        # Bumped on every set_preference so callers can cache derived state.
+        self._prefs_version = 0
+
+        # Opened here rather than in the writer thread so a failure (e.g.
+        # "database is locked") raises from the constructor instead of
+        # killing the thread and leaving flush() blocked forever.
+        # Explicit BEGIN/COMMIT per batch (autocommit mode otherwise).
+        writer_conn = sqlite3.connect(self._db_path, isolation_level=None, check_same_thread=False)
+        try:
+            self._configure_pragmas(writer_conn)
+        except Exception:
+            writer_conn.close()
+            raise
+        self._write_q: "queue.Queue[Tuple[str, Tuple[Any, ...], Optional[Future]]]" = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop, args=(writer_conn,), name="memory-writer", daemon=True
+        )
+        self._writer.start()
+
+    @staticmethod
+    def _configure_pragmas(conn: sqlite3.Connection) -> None:
+        # WAL + synchronous=NORMAL: commits no longer fsync the main DB file,
+        # and readers don't block the writer. Still durable across crashes.
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA mmap_size=268435456;")
+        conn.execute("PRAGMA cache_size=-20000;")
 
     def _init_schema(self) -> None:
         with self._lock:
@@ -49,12 +103,9 @@ class SqliteMemoryStore:
                 );
                 """
             )
-            cur.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_conversation_ts
-                ON conversation_messages(ts_ms);
-                """
-            )
+            # No query filters on ts_ms; the index only cost an extra b-tree
+            # update per INSERT. Drop it from existing DBs too.
+            cur.execute("DROP INDEX IF EXISTS idx_conversation_ts;")
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS preferences (
@@ -66,33 +117,98 @@ class SqliteMemoryStore:
             )
             self._conn.commit()
 
+    def _writer_loop(self, conn: sqlite3.Connection) -> None:
+        while True:
+            batch = [self._write_q.get()]
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW_S
+            while len(batch) < _WRITE_BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._apply_batch(conn, batch)
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+
+    @staticmethod
+    def _apply_batch(
+        conn: sqlite3.Connection,
+        batch: "List[Tuple[str, Tuple[Any, ...], Optional[Future]]]",
+    ) -> None:
+        try:
+            conn.execute("BEGIN;")
+            for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                conn.executemany(sql, [params for _sql, params, _fut in group])
+            conn.execute("COMMIT;")
+        except Exception:  # noqa: BLE001
+            try:
+                conn.execute("ROLLBACK;")
+            except sqlite3.Error:
+                pass
+        else:
+            for _sql, _params, fut in batch:
+                if fut is not None:
+                    fut.set_result(None)
+            return
+
+        # Replay one statement at a time (each autocommits) so only the
+        # offending statements are lost.
+        for sql, params, fut in batch:
+            try:
+                conn.execute(sql, params)
+            except Exception as e:  # noqa: BLE001
+                log(f"Memory store write failed (statement dropped): {e}")
+                if fut is not None:
+                    fut.set_exception(e)
+            else:
+                if fut is not None:
+                    fut.set_result(None)
+
+    def _enqueue_write(self, sql: str, params: Tuple[Any, ...], fut: Optional[Future] = None) -> None:
+        self._write_q.put((sql, params, fut))
+
+    def flush(self) -> None:
+        """Block until every enqueued write has been committed."""
+        self._write_q.join()
+
     def add_message(self, role: str, content: str) -> None:
         content = (content or "").strip()
         if not content:
             return
         ts_ms = int(time.time() * 1000)
-        with self._lock:
-            self._conn.execute(
-                "INSERT INTO conversation_messages (ts_ms, role, content) VALUES (?, ?, ?);",
-                (ts_ms, role, content),
-            )
-            self._conn.commit()
+        self._enqueue_write(
+            "INSERT INTO conversation_messages (ts_ms, role, content) VALUES (?, ?, ?);",
+            (ts_ms, role, content),
+        )
 
     def get_recent_messages(self, limit: int = 20) -> List[Dict[str, str]]:
         limit = max(0, min(int(limit), 200))
+        self.flush()
         with self._lock:
-            rows = self._conn.execute(
+            # Plain tuples (no sqlite3.Row) on this hot path: role/content are
+            # TEXT NOT NULL, so they arrive as str already.
+            cur = self._conn.cursor()
+            cur.row_factory = None
+            # Newest `limit` rows via the PK index, returned oldest-first.
+            rows = cur.execute(
                 """
                 SELECT role, content
-                FROM conversation_messages
-                ORDER BY id DESC
-                LIMIT ?;
+                FROM (
+                    SELECT id, role, content
+                    FROM conversation_messages
+                    ORDER BY id DESC
+                    LIMIT ?
+                )
+                ORDER BY id ASC;
                 """,
                 (limit,),
             ).fetchall()
-        # reverse to chronological order
-        rows = list(reversed(rows))
-        return [{"role": str(r["role"]), "content": str(r["content"])} for r in rows]
+        return [{"role": role, "content": content} for role, content in rows]
 
     def set_preference(self, key: str, value: str) -> None:
         key = (key or "").strip()
@@ -100,20 +216,34 @@ class SqliteMemoryStore:
         if not key:
             return
         ts_ms = int(time.time() * 1000)
+        fut: Future = Future()
+        self._enqueue_write(
+            """
+            INSERT INTO preferences (key, value, updated_ts_ms)
+            VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_ts_ms=excluded.updated_ts_ms;
+            """,
+            (key, value, ts_ms),
+            fut,
+        )
+        # Rare and user-visible: wait for the commit, re-raising its error,
+        # so the in-memory mirror never holds a value the DB didn't store.
+        try:
+            fut.result(timeout=_PREF_WRITE_TIMEOUT_S)
+        except FutureTimeoutError:
+            raise sqlite3.OperationalError(
+                f"preference write not committed after {_PREF_WRITE_TIMEOUT_S:g}s"
+            ) from None
         with self._lock:
-            self._conn.execute(
-                """
-                INSERT INTO preferences (key, value, updated_ts_ms)
-                VALUES (?, ?, ?)
-                ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_ts_ms=excluded.updated_ts_ms;
-                """,
-                (key, value, ts_ms),
-            )
-            self._conn.commit()
+            self._prefs_cache[key] = value
+            self._prefs_version += 1
+
+    def get_preferences_version(self) -> int:
+        return self._prefs_version
 
     def get_preferences(self) -> Dict[str, str]:
+        """Unordered copy of the saved preferences (served from memory)."""
         with self._lock:
-            rows = self._conn.execute("SELECT key, value FROM preferences ORDER BY key;").fetchall()
-        return {str(r["key"]): str(r["value"]) for r in rows}
+            return dict(self._prefs_cache)
 
 
@@ -4,6 +4,8 @@ Entry point maintained for backward compatibility.
 The websocket server implementation now lives in `python/ws_server.py`.
 """
 
+import sys
+
 from ws_server import main  # noqa: F401
 
 
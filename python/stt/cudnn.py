@@ -1,22 +1,50 @@
+import itertools
 import os
 import sys
+from typing import Iterator, Optional, Tuple
 
 from util.logging_utils import log
 
 
-def setup_cudnn_dll_path() -> None:
-    """Add cuDNN DLL directory to Windows DLL search path before model initialization."""
-    if sys.platform != "win32":
-        return
+_MARKER_DLLS = (
+    "cudnn_ops64_9.dll",
+    "cudnn_ops_infer64_8.dll",
+    "cudnn_cnn_infer64_8.dll",
+    "cublas64_11.dll",
+)
 
-    # IMPORTANT: keep add_dll_directory handles alive for the life of the process.
-    # If the returned handle is GC'd, Windows removes that directory from the search path.
-    global _DLL_DIR_HANDLES  # noqa: PLW0603
+
+def _cache_path() -> str:
+    return os.getenv("LOCAL_WHISPER_CUDNN_CACHE") or os.path.join(
+        os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), "local-whisper", "cudnn_dir.txt"
+    )
+
+
+def _read_cached_dir() -> Optional[Tuple[str, str]]:
+    """(dir, marker_dll) from the last successful run, if the marker still exists."""
     try:
-        _DLL_DIR_HANDLES
-    except NameError:
-        _DLL_DIR_HANDLES = []  # type: ignore[assignment]
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cached_dir, marker = f.read().splitlines()[:2]
+    except Exception:
+        return None
+    # One stat instead of the full candidate x marker scan.
+    if marker in _MARKER_DLLS and os.path.exists(os.path.join(cached_dir, marker)):
+        return cached_dir, marker
+    return None
 
+
+def _write_cached_dir(dll_dir: str, marker: str) -> None:
+    try:
+        path = _cache_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"{dll_dir}\n{marker}\n")
+    except Exception:
+        pass
+
+
+def _scan_candidate_dirs() -> Iterator[Tuple[str, str]]:
+    """Yield (dir, marker_dll) for every candidate directory containing a marker DLL."""
     vendor_cuda11_dir = os.path.join(os.path.dirname(__file__), "..", "vendor", "nvidia", "cuda11")
     vendor_cuda11_dir = os.path.abspath(vendor_cuda11_dir)
 
@@ -41,20 +69,42 @@ def setup_cudnn_dll_path() -> None:
     for p in cudnn_paths:
         if not p or not os.path.exists(p):
             continue
+        for dll in _MARKER_DLLS:
+            if os.path.exists(os.path.join(p, dll)):
+                yield p, dll
+                break
+
+
+def setup_cudnn_dll_path() -> None:
+    """
+    Add cuDNN DLL directory to Windows DLL search path before model initialization.
+
+    The resolved directory is cached in %LOCALAPPDATA%\\local-whisper\\cudnn_dir.txt
+    (override with LOCAL_WHISPER_CUDNN_CACHE) so later starts skip the scan.
+    An explicit CUDNN_PATH always triggers a fresh scan.
+    """
+    if sys.platform != "win32":
+        return
+
+    # IMPORTANT: keep add_dll_directory handles alive for the life of the process.
+    # If the returned handle is GC'd, Windows removes that directory from the search path.
+    global _DLL_DIR_HANDLES  # noqa: PLW0603
+    try:
+        _DLL_DIR_HANDLES
+    except NameError:
+        _DLL_DIR_HANDLES = []  # type: ignore[assignment]
 
-        marker_dlls = [
-            "cudnn_ops64_9.dll",
-            "cudnn_ops_infer64_8.dll",
-            "cudnn_cnn_infer64_8.dll",
-            "cublas64_11.dll",
-        ]
-        if any(os.path.exists(os.path.join(p, dll)) for dll in marker_dlls):
-            try:
-                _DLL_DIR_HANDLES.append(os.add_dll_directory(p))  # type: ignore[attr-defined]
-                log(f"Added cuDNN DLL directory: {p}")
-                return
-            except Exception as e:
-                log(f"Failed to add DLL directory {p}: {e}")
+    cached = None if os.getenv("CUDNN_PATH") else _read_cached_dir()
+    # The scan is lazy: it only runs if the cached directory is missing or unusable.
+    for p, marker in itertools.chain([cached] if cached else [], _scan_candidate_dirs()):
+        try:
+            _DLL_DIR_HANDLES.append(os.add_dll_directory(p))  # type: ignore[attr-defined]
+            log(f"Added cuDNN DLL directory: {p}")
+            if (p, marker) != cached:
+                _write_cached_dir(p, marker)
+            return
+        except Exception as e:
+            log(f"Failed to add DLL directory {p}: {e}")
 
     log("Warning: cuDNN DLL not found. GPU operations may fail. Install cuDNN or set CUDNN_PATH.")
 
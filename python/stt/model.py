@@ -1,71 +1,140 @@
 from __future__ import annotations
 
 import threading
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 from stt.cudnn import setup_cudnn_dll_path
 from stt.settings import SETTINGS
 from util.logging_utils import dbg, log
 
 
+# (model name, device, compute_type)
+ModelKey = Tuple[str, str, str]
+
 # faster_whisper is imported lazily inside get_model(): the import itself is
 # heavy and would otherwise delay the websocket server bind at startup.
-_MODEL: Optional[Any] = None
+# Loaded models are kept in an LRU keyed by the compute_type actually in use;
+# _KEY_ALIASES maps a requested key (e.g. compute_type="auto") to that key.
+_MODEL_CACHE: "OrderedDict[ModelKey, Any]" = OrderedDict()
+_KEY_ALIASES: Dict[ModelKey, ModelKey] = {}
 _MODEL_LOCK = threading.Lock()
 _MOONSHINE_TRANSCRIBER: Optional[Any] = None
 
 
-def get_model() -> Any:
-    global _MODEL  # noqa: PLW0603
-    if _MODEL is not None:
-        return _MODEL
+def get_model(
+    model: Optional[str] = None,
+    device: Optional[str] = None,
+    compute_type: Optional[str] = None,
+) -> Any:
+    """
+    Return a loaded WhisperModel, loading it on first use. Arguments default
+    to SETTINGS; up to SETTINGS.max_models configurations stay loaded.
+    """
+    uses_settings = model is None and device is None and compute_type is None
+    key: ModelKey = (
+        model or SETTINGS.model,
+        device or SETTINGS.device,
+        (compute_type if compute_type is not None else SETTINGS.compute_type or "").strip().lower(),
+    )
 
     with _MODEL_LOCK:
-        if _MODEL is not None:
-            return _MODEL
-        return _load_model_locked()
+        cached_key = _KEY_ALIASES.get(key, key)
+        cached = _MODEL_CACHE.get(cached_key)
+        if cached is not None:
+            _MODEL_CACHE.move_to_end(cached_key)
+            return cached
+
+        loaded, selected = _load_model_locked(*key)
+        loaded_key: ModelKey = (key[0], key[1], selected)
+        _MODEL_CACHE[loaded_key] = loaded
+        _MODEL_CACHE.move_to_end(loaded_key)
+        if loaded_key != key:
+            _KEY_ALIASES[key] = loaded_key
+        if uses_settings:
+            SETTINGS.compute_type = selected
+        _evict_locked()
+        return loaded
+
+
+def _evict_locked() -> None:
+    while len(_MODEL_CACHE) > max(1, SETTINGS.max_models):
+        evicted_key, evicted = _MODEL_CACHE.popitem(last=False)
+        for alias in [a for a, k in _KEY_ALIASES.items() if k == evicted_key]:
+            del _KEY_ALIASES[alias]
+        log(f"Evicting Whisper model {evicted_key}")
+        # No explicit unload_model(): a transcription may still hold this
+        # model. Dropping the cache's reference lets its memory be freed once
+        # the last in-flight call returns.
+        del evicted
+
+
+def _compute_candidates(requested: str, device: str) -> "list[str]":
+    """
+    compute_type values to try, in order. Unset/"auto" defers to
+    CTranslate2's own choice (one load, no ladder). Otherwise the pinned value
+    comes first, and fallbacks the device can't run are dropped up front so a
+    bad setting doesn't pay a full failed model init per candidate.
+    """
+    if requested in ("", "auto"):
+        return ["auto"]
+
+    candidates = [requested]
+    # int8 weights with FP16 activations: half the VRAM of float16 and
+    # usually faster than plain int8 on Tensor Core GPUs.
+    fallbacks = ["float16", "int8", "float32"]
+    if device == "cuda":
+        fallbacks.insert(0, "int8_float16")
+    for fallback in fallbacks:
+        if fallback not in candidates:
+            candidates.append(fallback)
 
+    try:
+        import ctranslate2
+
+        supported = ctranslate2.get_supported_compute_types(device)
+    except Exception:  # noqa: BLE001
+        return candidates
+    return [c for c in candidates if c in supported] or candidates
 
-def _load_model_locked() -> Any:
-    global _MODEL  # noqa: PLW0603
 
+def _load_model_locked(model_name: str, device: str, requested: str) -> Tuple[Any, str]:
+    """Load a WhisperModel; returns (model, compute_type actually selected)."""
     from faster_whisper import WhisperModel
 
     setup_cudnn_dll_path()
 
-    compute_candidates = [SETTINGS.compute_type]
-    for fallback in ("float16", "int8", "float32"):
-        if fallback not in compute_candidates:
-            compute_candidates.append(fallback)
-
     last_error: Exception | None = None
-    for compute_type in compute_candidates:
+    for compute_type in _compute_candidates(requested, device):
         try:
             dbg(
                 "H2",
                 "python/stt/model.py:get_model",
                 "attempt load_model",
-                {"model": SETTINGS.model, "device": SETTINGS.device, "compute_type": compute_type},
+                {"model": model_name, "device": device, "compute_type": compute_type},
             )
-            log(
-                "Loading model "
-                f"(model={SETTINGS.model}, device={SETTINGS.device}, compute_type={compute_type})"
-            )
-            _MODEL = WhisperModel(
-                SETTINGS.model,
-                device=SETTINGS.device,
+            log(f"Loading model (model={model_name}, device={device}, compute_type={compute_type})")
+            loaded = WhisperModel(
+                model_name,
+                device=device,
                 compute_type=compute_type,
                 download_root=SETTINGS.download_root,
+                cpu_threads=SETTINGS.cpu_threads,
+                num_workers=SETTINGS.num_workers,
             )
-            SETTINGS.compute_type = compute_type
+            # With "auto", report what CTranslate2 actually picked.
+            selected = getattr(getattr(loaded, "model", None), "compute_type", None) or compute_type
             dbg(
                 "H2",
                 "python/stt/model.py:get_model",
                 "load_model success",
-                {"selected_compute_type": compute_type},
+                {"selected_compute_type": selected},
             )
-            return _MODEL
-        except ValueError as e:
+            log(f"Whisper model loaded (compute_type={selected})")
+            return loaded, selected
+        except (ValueError, RuntimeError) as e:
+            # ValueError: unsupported compute type; RuntimeError: CTranslate2
+            # backend failures such as a cuDNN/cuBLAS mismatch.
             last_error = e
             log(f"Model load failed for compute_type={compute_type}: {e}")
 
@@ -109,6 +178,12 @@ def warm_up_whisper() -> None:
         segments, _info = model.transcribe(silence, language="en", beam_size=1, vad_filter=False)
         for _ in segments:
             pass
+        if SETTINGS.vad_filter:
+            # Silence would be filtered out entirely, so the inference above
+            # runs without VAD; load the Silero session separately.
+            from faster_whisper.vad import get_vad_model
+
+            get_vad_model()
         log("Whisper warm-up complete.")
     except Exception as e:  # noqa: BLE001
         log(f"Whisper warm-up failed: {e}")
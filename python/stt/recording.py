@@ -1,9 +1,11 @@
 import collections
 import contextlib
-import queue
+import functools
 import threading
-from typing import Callable, Optional
+import time
+from typing import Callable, Optional, Tuple
 
+import numpy as np
 import sounddevice as sd
 import webrtcvad
 
@@ -15,6 +17,35 @@ def _frame_samples() -> int:
     return int(SETTINGS.sample_rate * SETTINGS.frame_ms / 1000)
 
 
+class _FrameRing:
+    """
+    Single-producer/single-consumer frame buffer between the audio callback
+    and the capture loop. When full, put() silently evicts the oldest frame
+    (deque maxlen) rather than raising in the callback like queue.Full.
+    """
+
+    def __init__(self, maxlen: int) -> None:
+        self._frames: "collections.deque[bytes]" = collections.deque(maxlen=maxlen)
+        self._ready = threading.Event()
+
+    def put(self, frame: bytes) -> None:
+        self._frames.append(frame)
+        self._ready.set()
+
+    def get(self, timeout: float) -> Optional[bytes]:
+        """Next frame, or None if none arrived within `timeout` seconds."""
+        frames = self._frames
+        while not frames:
+            self._ready.clear()
+            # Re-check after clearing: a put() landing between the emptiness
+            # check and clear() would otherwise be a lost wakeup.
+            if frames:
+                break
+            if not self._ready.wait(timeout):
+                return None
+        return frames.popleft()
+
+
 class _PersistentMic:
     """
     Keeps one always-open input stream so sessions start instantly (no
@@ -28,7 +59,7 @@ class _PersistentMic:
         self._ring: "collections.deque[bytes]" = collections.deque(
             maxlen=max(1, SETTINGS.pre_roll_ms // SETTINGS.frame_ms)
         )
-        self._session_q: "queue.Queue[bytes] | None" = None
+        self._session_q: "_FrameRing | None" = None
 
     def ensure_started(self) -> bool:
         with self._lock:
@@ -52,26 +83,22 @@ class _PersistentMic:
                 return False
 
     def _callback(self, indata, frames, time, status):  # noqa: ANN001
-        pcm = indata.reshape(-1).tobytes()
+        # indata is a C-contiguous (frames, 1) int16 array: bytes() copies
+        # its buffer in one memcpy, no reshape/tobytes detour.
+        pcm = bytes(indata)
         with self._lock:
             self._ring.append(pcm)
             q = self._session_q
         if q is not None:
-            try:
-                q.put_nowait(pcm)
-            except queue.Full:
-                pass
+            q.put(pcm)
 
-    def start_session(self) -> "queue.Queue[bytes]":
-        q: "queue.Queue[bytes]" = queue.Queue(maxsize=1024)
+    def start_session(self) -> _FrameRing:
+        q = _FrameRing(maxlen=1024)
         with self._lock:
             # Seed with pre-roll so speech that started just before the
             # session message arrived isn't clipped.
             for frame in self._ring:
-                try:
-                    q.put_nowait(frame)
-                except queue.Full:
-                    break
+                q.put(frame)
             self._session_q = q
         return q
 
@@ -91,64 +118,93 @@ def warm_up_mic() -> None:
 def record_pcm_until_silence(
     stop_event: "threading.Event | None" = None,
     on_frame: Optional[Callable[[bytes], None]] = None,
-) -> bytes:
+) -> Tuple[np.ndarray, int]:
     """
     Record 16kHz mono int16 PCM until silence thresholds are met, or stop_event
-    is set. Captures everything from session start (no VAD gating of the onset);
-    returns b"" if no speech was detected at all. `on_frame` is invoked with
-    each captured frame, enabling streaming transcription during recording.
+    is set. Captures everything from session start (no VAD gating of the onset).
+    Returns (pcm, voiced_ms): pcm is empty if no speech was detected at all,
+    and voiced_ms is how much of it webrtcvad classed as speech. `on_frame` is
+    invoked with each captured frame, enabling streaming transcription during
+    recording.
+
+    The result is a view into a buffer preallocated for max_record_ms, so
+    frames are copied exactly once and never joined.
     """
     if SETTINGS.frame_ms not in (10, 20, 30):
         raise ValueError("VAD_FRAME_MS must be one of 10, 20, 30")
 
     vad = webrtcvad.Vad(int(max(0, min(3, SETTINGS.vad_aggressiveness))))
-    frame_bytes = _frame_samples() * 2
+    frame_samples = _frame_samples()
+    frame_bytes = frame_samples * 2
 
     use_persistent = SETTINGS.persistent_mic and _MIC.ensure_started()
     if use_persistent:
         q = _MIC.start_session()
         stream_cm = contextlib.nullcontext()
     else:
-        q = queue.Queue(maxsize=256)
-
-        def callback(indata, frames, time, status):  # noqa: ANN001
-            try:
-                q.put_nowait(indata.reshape(-1).tobytes())
-            except queue.Full:
-                pass
-
-        stream_cm = sd.InputStream(
+        # Per-session stream: no callback. This thread blocks on PortAudio
+        # in read(), so frames need no handoff from the audio thread.
+        stream_cm = sd.RawInputStream(
             samplerate=SETTINGS.sample_rate,
             channels=1,
             dtype="int16",
-            blocksize=_frame_samples(),
-            callback=callback,
+            blocksize=frame_samples,
         )
 
-    captured = bytearray()
-    any_speech = False
+    # The loop stops once total_ms reaches max_record_ms, so this holds
+    # every frame it can take (pre-roll included) plus one of slack.
+    pcm = np.empty(int(SETTINGS.max_record_ms * SETTINGS.sample_rate / 1000) + frame_samples, dtype=np.int16)
+    n = 0
+    # Hot-loop locals: ~33 iterations/s, each would otherwise re-read the
+    # settings dataclass and the bound VAD method.
+    frame_ms = SETTINGS.frame_ms
+    sample_rate = SETTINGS.sample_rate
+    max_record_ms = SETTINGS.max_record_ms
+    max_silence_ms = SETTINGS.max_silence_ms
+    min_record_ms = SETTINGS.min_record_ms
+    is_speech = vad.is_speech
+    voiced_ms = 0
     silence_ms = 0
     total_ms = 0
     stop_reason = "unknown"
 
     try:
-        with stream_cm:
+        with stream_cm as stream:
+            if use_persistent:
+                get_frame = functools.partial(q.get, 2)
+            else:
+
+                poll_s = frame_ms / 2000
+
+                def get_frame() -> Optional[bytes]:
+                    # read() blocks with no timeout, so only call it once a
+                    # full frame is buffered; None after 2s without one
+                    # (same stall guard as the persistent path). Device
+                    # errors surface here as PortAudioError.
+                    if stream.read_available < frame_samples:
+                        deadline = time.monotonic() + 2
+                        while stream.read_available < frame_samples:
+                            if time.monotonic() >= deadline:
+                                return None
+                            time.sleep(poll_s)
+                    data, _overflowed = stream.read(frame_samples)
+                    return data
+
             dbg(
                 "H_PTT2",
                 "python/stt/recording.py:record_pcm_until_silence",
                 "record loop start",
                 {
                     "persistent": use_persistent,
-                    "frame_ms": SETTINGS.frame_ms,
-                    "max_silence_ms": SETTINGS.max_silence_ms,
-                    "max_record_ms": SETTINGS.max_record_ms,
-                    "min_record_ms": SETTINGS.min_record_ms,
+                    "frame_ms": frame_ms,
+                    "max_silence_ms": max_silence_ms,
+                    "max_record_ms": max_record_ms,
+                    "min_record_ms": min_record_ms,
                 },
             )
             while True:
-                try:
-                    frame = q.get(timeout=2)
-                except queue.Empty:
+                frame = get_frame()
+                if frame is None:
                     # Stream stalled (e.g. device lost); don't hang the session.
                     stop_reason = "stream_stalled"
                     break
@@ -159,21 +215,24 @@ def record_pcm_until_silence(
                     stop_reason = "stop"
                     break
 
-                total_ms += SETTINGS.frame_ms
-                captured.extend(frame)
+                total_ms += frame_ms
+                pcm[n : n + frame_samples] = np.frombuffer(frame, dtype=np.int16, count=frame_samples)
+                n += frame_samples
                 if on_frame is not None:
                     on_frame(frame)
 
-                if vad.is_speech(frame, SETTINGS.sample_rate):
-                    any_speech = True
+                # webrtcvad takes any bytes-like buffer, so the stream's read
+                # buffer goes in as-is (no bytes() copy); the sample count is fixed.
+                if is_speech(frame, sample_rate, frame_samples):
+                    voiced_ms += frame_ms
                     silence_ms = 0
                 else:
-                    silence_ms += SETTINGS.frame_ms
+                    silence_ms += frame_ms
 
-                if total_ms >= SETTINGS.max_record_ms:
+                if total_ms >= max_record_ms:
                     stop_reason = "max_record_ms"
                     break
-                if silence_ms >= SETTINGS.max_silence_ms and total_ms >= SETTINGS.min_record_ms:
+                if silence_ms >= max_silence_ms and total_ms >= min_record_ms:
                     stop_reason = "silence"
                     break
     finally:
@@ -184,7 +243,7 @@ def record_pcm_until_silence(
         "H_PTT2",
         "python/stt/recording.py:record_pcm_until_silence",
         f"stop reason: {stop_reason}",
-        {"total_ms": total_ms, "silence_ms": silence_ms, "any_speech": any_speech},
+        {"total_ms": total_ms, "silence_ms": silence_ms, "voiced_ms": voiced_ms},
     )
 
-    return bytes(captured) if any_speech else b""
+    return (pcm[:n] if voiced_ms else pcm[:0]), voiced_ms
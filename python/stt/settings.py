@@ -3,7 +3,9 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+# slots: SETTINGS is read from per-frame paths. Not frozen: get_model()
+# records the compute_type it actually loaded.
+@dataclass(slots=True)
 class Settings:
     host: str = os.getenv("LOCAL_WHISPER_HOST", "127.0.0.1")
     port: int = int(os.getenv("LOCAL_WHISPER_PORT", "8765"))
@@ -12,6 +14,22 @@ class Settings:
     device: str = os.getenv("WHISPER_DEVICE", "cuda")
     compute_type: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
     download_root: Optional[str] = os.getenv("WHISPER_MODEL_DIR") or None
+    # How many (model, device, compute_type) configurations stay loaded at once.
+    max_models: int = int(os.getenv("WHISPER_MAX_MODELS", "1"))
+    # CTranslate2 threading: 0 threads = library default; workers > 1 allow
+    # concurrent transcriptions on the same model.
+    cpu_threads: int = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+    num_workers: int = max(1, int(os.getenv("WHISPER_NUM_WORKERS", "1")))
+    # Load the model and run a silent inference at startup so the first
+    # utterance doesn't pay model load + CUDA init. Set to 0 to defer.
+    whisper_warmup: bool = os.getenv("WHISPER_WARMUP", "1") != "0"
+    # 1 = greedy decoding (lowest latency); raise for accuracy over speed.
+    beam_size: int = max(1, int(os.getenv("WHISPER_BEAM_SIZE", "1")))
+    # Run faster-whisper's Silero VAD before the encoder: trims silence
+    # webrtcvad let through and suppresses hallucinations on empty audio.
+    vad_filter: bool = os.getenv("WHISPER_VAD_FILTER", "1") != "0"
+    vad_min_silence_ms: int = int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", "400"))
+    vad_threshold: float = float(os.getenv("WHISPER_VAD_THRESHOLD", "0.35"))
 
     sample_rate: int = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
     vad_aggressiveness: int = int(os.getenv("VAD_AGGRESSIVENESS", "2"))  # 0..3
@@ -30,6 +48,10 @@ class Settings:
     max_silence_ms: int = int(os.getenv("MAX_SILENCE_MS", "5000"))
     max_record_ms: int = int(os.getenv("MAX_RECORD_MS", "120000"))
     min_record_ms: int = int(os.getenv("MIN_RECORD_MS", "5000"))
+    # Recordings with less speech than this (accidental taps, noise) return
+    # an empty result without running the model. Kept low so one-word
+    # commands ("stop", "yes") still get through; 0 disables the check.
+    min_voiced_ms: int = int(os.getenv("MIN_VOICED_MS", "100"))
 
     moonshine_model_dir: Optional[str] = os.getenv("MOONSHINE_MODEL_DIR") or None
     moonshine_model_arch: int = int(os.getenv("MOONSHINE_MODEL_ARCH", "5"))  # 5 = MEDIUM_STREAMING
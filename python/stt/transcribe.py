@@ -1,23 +1,90 @@
+import threading
+from typing import Any, Optional
+
 from stt.model import get_model, get_moonshine_transcriber
 from stt.settings import SETTINGS
 
 
-def transcribe_pcm(pcm_bytes: bytes) -> str:
-    """Transcribe int16 PCM with Whisper, fed directly (no temp WAV round trip)."""
+_INT16_SCALE = 1.0 / 32768.0
+
+# Greedy first; only segments that fail the compression-ratio / log-prob
+# checks below are re-decoded at higher temperatures.
+_TEMPERATURE_FALLBACK = [0.0, 0.2, 0.4, 0.6]
+
+# Reusable float32 buffers for Whisper input, sized for max_record_ms (grown
+# if ever exceeded). A buffer is checked out from conversion through the last
+# segment, since faster-whisper decodes lazily while segments are iterated;
+# up to SETTINGS.num_workers are kept, so concurrent transcriptions each get
+# their own.
+_SCRATCH_FREE: "list[Any]" = []
+_SCRATCH_LOCK = threading.Lock()
+
+
+def _pcm_to_float32(pcm, out: Optional[Any] = None) -> "numpy.ndarray":  # noqa: ANN001, F821
+    """
+    int16 PCM (bytes or an int16 array) -> float32 in [-1, 1): cast and
+    scale fused into one pass, written into `out[:n]` when given.
+    """
     import numpy as np
 
+    samples = np.frombuffer(pcm, dtype=np.int16)
+    if out is None:
+        return np.multiply(samples, np.float32(_INT16_SCALE), dtype=np.float32)
+    audio = out[: len(samples)]
+    np.multiply(samples, np.float32(_INT16_SCALE), out=audio, casting="unsafe")
+    return audio
+
+
+def _acquire_scratch(n: int) -> "numpy.ndarray":  # noqa: F821
+    """A free scratch buffer with room for n samples (allocated if none is)."""
+    import numpy as np
+
+    with _SCRATCH_LOCK:
+        buf = _SCRATCH_FREE.pop() if _SCRATCH_FREE else None
+    if buf is None or len(buf) < n:
+        default = int(SETTINGS.max_record_ms * SETTINGS.sample_rate / 1000)
+        buf = np.empty(max(n, default), dtype=np.float32)
+    return buf
+
+
+def _release_scratch(buf: "numpy.ndarray") -> None:  # noqa: F821
+    with _SCRATCH_LOCK:
+        if len(_SCRATCH_FREE) < SETTINGS.num_workers:
+            _SCRATCH_FREE.append(buf)
+
+
+def transcribe_pcm(pcm) -> str:  # noqa: ANN001
+    """
+    Transcribe int16 PCM (bytes or the recorder's int16 array) with Whisper,
+    fed directly (no temp WAV round trip).
+    """
     model = get_model()
-    audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-    segments, _info = model.transcribe(
-        audio,
-        language="en",
-        vad_filter=False,
-        # Greedy decoding: ~2-3x faster than beam 3 and near-identical for
-        # short dictation. Don't condition across segments either.
-        beam_size=1,
-        condition_on_previous_text=False,
-    )
-    return "".join(seg.text for seg in segments).strip()
+    scratch = _acquire_scratch(memoryview(pcm).nbytes // 2)
+    try:
+        audio = _pcm_to_float32(pcm, out=scratch)
+        segments, _info = model.transcribe(
+            audio,
+            language="en",
+            # webrtcvad only decides when recording stops; Silero drops the
+            # silent stretches so the encoder never sees them.
+            vad_filter=SETTINGS.vad_filter,
+            vad_parameters={
+                "min_silence_duration_ms": SETTINGS.vad_min_silence_ms,
+                "threshold": SETTINGS.vad_threshold,
+            },
+            # Greedy by default: ~2-3x faster than beam 3 and near-identical for
+            # short dictation. Don't condition across segments either.
+            beam_size=SETTINGS.beam_size,
+            best_of=1,
+            temperature=_TEMPERATURE_FALLBACK,
+            compression_ratio_threshold=2.4,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,
+            condition_on_previous_text=False,
+        )
+        return "".join(seg.text for seg in segments).strip()
+    finally:
+        _release_scratch(scratch)
 
 
 class MoonshineStreamingSession:
@@ -28,10 +95,8 @@ class MoonshineStreamingSession:
     """
 
     def __init__(self) -> None:
-        import numpy as np
         from moonshine_voice import TranscriptEventListener
 
-        self._np = np
         self._transcriber = get_moonshine_transcriber()
         self._lines: list[str] = []
         self.finished = False
@@ -48,7 +113,7 @@ class MoonshineStreamingSession:
         self._transcriber.start()
 
     def feed(self, frame: bytes) -> None:
-        audio = self._np.frombuffer(frame, dtype=self._np.int16).astype(self._np.float32) / 32768.0
+        audio = _pcm_to_float32(frame)
         self._transcriber.add_audio(audio, SETTINGS.sample_rate)
 
     def finish(self) -> str:
@@ -1,20 +1,38 @@
 import os
+import struct
 import tempfile
-import wave
 
 from stt.settings import SETTINGS
 
 
-def write_pcm_to_temp_wav(pcm_bytes: bytes) -> str:
-    fd, wav_path = tempfile.mkstemp(prefix="localwhisper_", suffix=".wav")
-    os.close(fd)
-
-    with wave.open(wav_path, "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)  # int16
-        wf.setframerate(SETTINGS.sample_rate)
-        wf.writeframes(pcm_bytes)
+def _wav_header(data_bytes: int, sample_rate: int) -> bytes:
+    """Canonical 44-byte RIFF header for mono int16 PCM."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # mono
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        data_bytes,
+    )
 
-    return wav_path
 
+def write_pcm_to_temp_wav(pcm) -> str:  # noqa: ANN001
+    """Debug helper: save int16 mono PCM to a temp WAV and return its path."""
+    data = memoryview(pcm).cast("B")
+    fd, wav_path = tempfile.mkstemp(prefix="localwhisper_", suffix=".wav")
+    # Header size is known up front: one header write plus one data write,
+    # no seek-back to patch lengths as wave.Wave_write does.
+    with os.fdopen(fd, "wb") as f:
+        f.write(_wav_header(data.nbytes, SETTINGS.sample_rate))
+        f.write(data)
 
+    return wav_path
@@ -1,23 +1,27 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Tuple
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
 
 from memory.sqlite_store import SqliteMemoryStore
 from tools.sandbox_fs import SandboxConfig, SandboxFS, SandboxViolation
 
 
-def build_tools() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def build_tools(
+    memory_store: Optional[SqliteMemoryStore] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Returns (tool_schemas_openai, tool_functions)
 
     tool_functions are sync callables that accept a single args dict and return str.
+    Pass the agent's `memory_store` so preference writes share its writer thread.
     """
     sandbox_root = os.getenv("ASSISTANT_SANDBOX_ROOT") or os.path.abspath(
         os.path.join(os.path.dirname(__file__), "..", "sandbox")
     )
     fs = SandboxFS(SandboxConfig(root_dir=sandbox_root))
-    mem = SqliteMemoryStore()
+    mem = memory_store or SqliteMemoryStore()
 
     def read_file(args: Dict[str, Any]) -> str:
         try:
@@ -56,7 +60,10 @@ def build_tools() -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         value = str(args.get("value") or "").strip()
         if not key:
             return "Error: key is required."
-        mem.set_preference(key, value)
+        try:
+            mem.set_preference(key, value)
+        except sqlite3.Error as e:
+            return f"Error: could not save preference: {e}"
         return f"Saved preference: {key}"
 
     tool_schemas = [
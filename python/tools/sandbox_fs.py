@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import functools
+import mmap
 import os
+import re
+import stat
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+# A ".." path component, with either separator.
+_TRAVERSE_RE = re.compile(r"(?:^|[\\/])\.\.(?:[\\/]|$)")
 
 
 class SandboxViolation(Exception):
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SandboxConfig:
     root_dir: str
     max_read_bytes: int = 200_000
@@ -17,10 +25,32 @@ class SandboxConfig:
     max_search_results: int = 50
 
 
+def _iter_line_matches(mm: mmap.mmap, next_hit: Callable[[int], int]) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (line number, line bytes) for each line of `mm` containing a hit,
+    at most once per line. Lines are only located (and counted) around hits.
+    """
+    lineno = 1
+    counted_to = 0
+    pos = next_hit(0)
+    while pos != -1:
+        start = mm.rfind(b"\n", 0, pos) + 1
+        end = mm.find(b"\n", pos)
+        if end == -1:
+            end = len(mm)
+        lineno += mm[counted_to:start].count(b"\n")
+        counted_to = start
+        yield lineno, mm[start:end]
+        pos = next_hit(end + 1)
+
+
 class SandboxFS:
     def __init__(self, config: SandboxConfig) -> None:
         self._cfg = config
         self._root = os.path.abspath(config.root_dir)
+        # Resolved paths must equal the root or start with this (a drive
+        # root like C:\ already ends with a separator).
+        self._root_prefix = self._root if self._root.endswith(os.sep) else self._root + os.sep
         os.makedirs(self._root, exist_ok=True)
 
     @property
@@ -37,24 +67,35 @@ class SandboxFS:
         if ":" in rel_path:
             raise SandboxViolation("Drive letters are not allowed.")
         norm = os.path.normpath(rel_path).lstrip("\\/")  # normalize and remove leading separators
-        if norm.startswith("..") or "\\..\\" in f"\\{norm}\\" or "/../" in f"/{norm}/":
+        if _TRAVERSE_RE.search(norm):
             raise SandboxViolation("Path traversal is not allowed.")
         full = os.path.abspath(os.path.join(self._root, norm))
-        if os.path.commonpath([self._root, full]) != self._root:
+        if full != self._root and not full.startswith(self._root_prefix):
             raise SandboxViolation("Path escapes sandbox root.")
         return full
 
     def read_text(self, rel_path: str) -> str:
         full = self._resolve(rel_path)
-        if not os.path.exists(full):
-            raise SandboxViolation("File does not exist.")
-        if os.path.isdir(full):
+        # One stat answers exists / is-dir / size.
+        try:
+            st = os.stat(full)
+        except FileNotFoundError:
+            raise SandboxViolation("File does not exist.") from None
+        if stat.S_ISDIR(st.st_mode):
             raise SandboxViolation("Path is a directory.")
-        size = os.path.getsize(full)
-        if size > self._cfg.max_read_bytes:
+        if st.st_size > self._cfg.max_read_bytes:
             raise SandboxViolation(f"File too large to read (>{self._cfg.max_read_bytes} bytes).")
-        with open(full, "r", encoding="utf-8", errors="replace") as f:
-            return f.read()
+        # Size is capped, so a single raw read gets it all; decode once.
+        fd = os.open(full, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            data = os.read(fd, st.st_size)
+        finally:
+            os.close(fd)
+        text = data.decode("utf-8", errors="replace")
+        if "\r" in text:
+            # Match text-mode reads: universal newlines.
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
 
     def write_text_create_only(self, rel_path: str, content: str) -> str:
         full = self._resolve(rel_path)
@@ -93,21 +134,50 @@ class SandboxFS:
             raise SandboxViolation("Search directory does not exist.")
 
         results: List[str] = []
-        for root, _dirs, files in os.walk(base):
-            for fn in files:
-                full = os.path.join(root, fn)
-                rel = os.path.relpath(full, self._root)
-                try:
-                    if os.path.getsize(full) > self._cfg.max_read_bytes:
-                        continue
-                    with open(full, "r", encoding="utf-8", errors="replace") as f:
-                        for i, line in enumerate(f, start=1):
-                            if query in line:
-                                results.append(f"{rel}:{i}:{line.rstrip()}")
-                                if len(results) >= self._cfg.max_search_results:
-                                    return results
-                except Exception:
-                    continue
+        needle = query.encode("utf-8")
+        if b"\n" in needle:
+            # Matches are per line, so a multi-line query can never match.
+            return results
+        for full, size in self._iter_files(base):
+            # Empty files can't be mapped (and can't match).
+            if size == 0 or size > self._cfg.max_read_bytes:
+                continue
+            rel = os.path.relpath(full, self._root)
+            try:
+                with open(full, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for i, line in _iter_line_matches(mm, functools.partial(mm.find, needle)):
+                        text = line.decode("utf-8", errors="replace").rstrip()
+                        results.append(f"{rel}:{i}:{text}")
+                        if len(results) >= self._cfg.max_search_results:
+                            return results
+            except Exception:
+                continue
         return results
 
+    @staticmethod
+    def _iter_files(base: str) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (path, size) for every regular file under `base`, top-down like
+        os.walk. Sizes come from the scandir entry (no extra stat per file on
+        Windows). Symlinks are neither followed nor reported, so a link can't
+        point a search outside the sandbox. Unreadable directories are skipped.
+        """
+        stack = [base]
+        while stack:
+            current = stack.pop()
+            subdirs: List[str] = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                yield entry.path, entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            stack.extend(reversed(subdirs))
+
 
@@ -1,10 +1,107 @@
 import os
 import subprocess
+import threading
+from typing import Any, Optional
+
+from util.logging_utils import log
+
+
+# SAPI SpeechVoiceSpeakFlags. Speech is started async only so it can be
+# bounded by WaitUntilDone(); speak() still returns once speech ends, which
+# the "speaking" UI state relies on.
+_SVSF_ASYNC = 1
+_SVSF_PURGE_BEFORE_SPEAK = 2
+
+# Give up on an utterance after this long, as the old per-call subprocess did.
+_SPEAK_TIMEOUT_S = 120
+
+# Preferred backend: SAPI bound in-process through pywin32. COM objects are
+# apartment-bound, so each thread that speaks gets its own SpVoice.
+_COM_MISSING = False
+_local = threading.local()
+
+# Fallback backend: one long-lived PowerShell that keeps System.Speech loaded
+# and speaks one stdin line per utterance, acking each on stdout.
+_PS_SCRIPT = (
+    "[Console]::InputEncoding=[Text.Encoding]::UTF8;"
+    "Add-Type -AssemblyName System.Speech;"
+    "$s=New-Object System.Speech.Synthesis.SpeechSynthesizer;"
+    "while(($l=[Console]::In.ReadLine()) -ne $null){"
+    "if($l){$s.Speak($l)};"
+    "[Console]::Out.WriteLine('.');[Console]::Out.Flush()"
+    "}"
+)
+_ps_proc: "subprocess.Popen | None" = None
+_ps_lock = threading.Lock()
+
+
+def _com_voice() -> Optional[Any]:
+    """This thread's SpVoice, or None if pywin32 is unavailable."""
+    global _COM_MISSING  # noqa: PLW0603
+    voice = getattr(_local, "voice", None)
+    if voice is not None or _COM_MISSING:
+        return voice
+    try:
+        import pythoncom
+        import win32com.client
+    except ImportError:
+        _COM_MISSING = True
+        log("pywin32 not installed; using PowerShell for TTS.")
+        return None
+    try:
+        pythoncom.CoInitialize()
+        voice = win32com.client.Dispatch("SAPI.SpVoice")
+    except Exception as e:  # noqa: BLE001
+        # Would fail the same way on every call; switch backends for good.
+        _COM_MISSING = True
+        log(f"SAPI COM setup failed; using PowerShell for TTS: {e}")
+        return None
+    _local.voice = voice
+    return voice
+
+
+def _speak_com(voice: Any, text: str) -> None:
+    voice.Speak(text, _SVSF_ASYNC)
+    if not voice.WaitUntilDone(_SPEAK_TIMEOUT_S * 1000):
+        # Timed out: drop whatever is still queued on this voice.
+        voice.Speak("", _SVSF_ASYNC | _SVSF_PURGE_BEFORE_SPEAK)
+
+
+def _speak_powershell(text: str) -> None:
+    global _ps_proc  # noqa: PLW0603
+    # One line per utterance: the worker reads line-delimited input.
+    line = " ".join(text.splitlines())
+    with _ps_lock:
+        proc = _ps_proc
+        if proc is None or proc.poll() is not None:
+            proc = subprocess.Popen(
+                ["powershell", "-NoProfile", "-NonInteractive", "-Command", _PS_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            _ps_proc = proc
+        # Kill a wedged worker instead of blocking the session forever; the
+        # next call starts a fresh one.
+        watchdog = threading.Timer(_SPEAK_TIMEOUT_S, proc.kill)
+        watchdog.start()
+        try:
+            proc.stdin.write(line.encode("utf-8") + b"\n")
+            proc.stdin.flush()
+            if not proc.stdout.readline():
+                _ps_proc = None
+        except OSError:
+            proc.kill()
+            _ps_proc = None
+        finally:
+            watchdog.cancel()
 
 
 def speak(text: str) -> None:
     """
-    Speak text out loud using Windows SAPI via PowerShell (local, no extra deps).
+    Speak text out loud using Windows SAPI (local). Uses pywin32 in-process
+    when installed, otherwise a persistent PowerShell worker; either way no
+    process or CLR startup per utterance. Blocks until speech finishes.
     """
     enabled = (os.getenv("ASSISTANT_TTS_ENABLED", "1") or "1") != "0"
     if not enabled:
@@ -14,25 +111,12 @@ def speak(text: str) -> None:
     if not text:
         return
 
-    # Read text from stdin to avoid command injection/escaping issues.
-    script = (
-        "$t=[Console]::In.ReadToEnd();"
-        "Add-Type -AssemblyName System.Speech;"
-        "$s=New-Object System.Speech.Synthesis.SpeechSynthesizer;"
-        "$s.Speak($t);"
-    )
-
     try:
-        subprocess.run(
-            ["powershell", "-NoProfile", "-NonInteractive", "-Command", script],
-            input=text.encode("utf-8"),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=120,
-            check=False,
-        )
+        voice = _com_voice()
+        if voice is not None:
+            _speak_com(voice, text)
+        else:
+            _speak_powershell(text)
     except Exception:
         # Best-effort only; don't crash the WS server.
         return
-
-
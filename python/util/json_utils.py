@@ -0,0 +1,27 @@
+"""
+JSON helpers: orjson when installed, stdlib otherwise.
+
+`dumps` always returns UTF-8 bytes and `loads` accepts bytes or str, so
+callers can hand payloads straight to sockets/files without transcoding.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    loads = json.loads
+
+
+# orjson.JSONDecodeError and json.JSONDecodeError both subclass ValueError.
+JSONDecodeError = ValueError
@@ -1,37 +1,120 @@
-import json
+import atexit
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+
+from util import json_utils
 
 
 def log(message: str) -> None:
-    ts = datetime.now().strftime("%H:%M:%S")
+    # time.strftime formats the C struct directly; no datetime object.
+    ts = time.strftime("%H:%M:%S")
     print(f"[{ts}] {message}", flush=True)
 
 
+# Read once: dbg() is called from hot paths and must cost nothing when off.
+_DBG_ENABLED = os.getenv("LOCAL_WHISPER_DEBUG") == "1"
+_DBG_RUN_ID = os.getenv("LOCAL_WHISPER_RUN_ID", "run")
 _DBG_LOG_PATH = os.getenv("LOCAL_WHISPER_DEBUG_LOG_PATH") or os.path.join(
     os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "debug.log"
 )
 
+# dbg() only enqueues; one daemon thread appends to the log file in batches
+# of up to _DBG_BATCH_MAX lines or every _DBG_BATCH_WINDOW_S seconds.
+_DBG_BATCH_MAX = 20
+_DBG_BATCH_WINDOW_S = 0.1
+_DBG_Q: "queue.Queue[dict]" = queue.Queue()
+_DBG_WRITER: "threading.Thread | None" = None
+_DBG_WRITER_LOCK = threading.Lock()
+# Opened on the first batch and kept open; the lock also serializes the
+# writer thread against the atexit drain.
+_DBG_FILE = None
+_DBG_FILE_LOCK = threading.Lock()
+
+
+def _write_dbg_batch(batch: "list[dict]") -> None:
+    global _DBG_FILE  # noqa: PLW0603
+    lines = []
+    for payload in batch:
+        try:
+            lines.append(json_utils.dumps(payload) + b"\n")
+        except Exception:
+            continue
+    with _DBG_FILE_LOCK:
+        try:
+            if _DBG_FILE is None:
+                _DBG_FILE = open(_DBG_LOG_PATH, "ab")  # noqa: SIM115
+            _DBG_FILE.write(b"".join(lines))
+            _DBG_FILE.flush()
+        except Exception:
+            # Drop the handle so the next batch retries the open.
+            try:
+                if _DBG_FILE is not None:
+                    _DBG_FILE.close()
+            except Exception:
+                pass
+            _DBG_FILE = None
+
+
+def _drain_dbg_queue() -> None:
+    batch = []
+    while True:
+        try:
+            batch.append(_DBG_Q.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_dbg_batch(batch)
+
+
+def _dbg_writer_loop() -> None:
+    while True:
+        batch = [_DBG_Q.get()]
+        deadline = time.monotonic() + _DBG_BATCH_WINDOW_S
+        while len(batch) < _DBG_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_DBG_Q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _write_dbg_batch(batch)
+
+
+def _ensure_dbg_writer() -> None:
+    global _DBG_WRITER  # noqa: PLW0603
+    with _DBG_WRITER_LOCK:
+        if _DBG_WRITER is None:
+            _DBG_WRITER = threading.Thread(target=_dbg_writer_loop, name="dbg-writer", daemon=True)
+            _DBG_WRITER.start()
+            # The writer is a daemon thread; write whatever is still queued at exit.
+            atexit.register(_drain_dbg_queue)
+
 
 def dbg(hypothesis_id: str, location: str, message: str, data: dict) -> None:
     """
     Best-effort debug logger. Writes JSONL to a local file.
 
-    Intended for development only; failures are swallowed.
+    Intended for development only: a no-op unless LOCAL_WHISPER_DEBUG=1 was set
+    at import.
+    Writes happen on a background thread; failures are swallowed.
     """
+    if not _DBG_ENABLED:
+        return
     try:
         payload = {
             "sessionId": "debug-session",
-            "runId": os.getenv("LOCAL_WHISPER_RUN_ID", "run"),
+            "runId": _DBG_RUN_ID,
             "hypothesisId": hypothesis_id,
             "location": location,
             "message": message,
             "data": data,
-            "timestamp": int(datetime.now().timestamp() * 1000),
+            "timestamp": time.time_ns() // 1_000_000,
         }
-        with open(_DBG_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
+        if _DBG_WRITER is None:
+            _ensure_dbg_writer()
+        _DBG_Q.put_nowait(payload)
     except Exception:
         pass
-
-
@@ -16,11 +16,15 @@ from stt.model import warm_up_moonshine, warm_up_whisper
 from stt.recording import record_pcm_until_silence, warm_up_mic
 from stt.settings import SETTINGS
 from stt.transcribe import MoonshineStreamingSession, transcribe_pcm
+from stt.wav_utils import write_pcm_to_temp_wav
 from tts.sapi_tts import speak
 from tools.assistant_tools import build_tools
 from util.logging_utils import dbg, log
 
 
+# Debug aid: keep each captured utterance as a temp WAV (path is logged).
+_DUMP_WAV = os.getenv("LOCAL_WHISPER_DUMP_WAV") == "1"
+
 dbg("H1", "python/ws_server.py:startup", "python module import", {"pid": os.getpid()})
 
 
@@ -43,7 +47,7 @@ class AppState:
 
 STATE = AppState()
 AGENT = SimpleAgent()
-_tool_schemas, _tool_fns = build_tools()
+_tool_schemas, _tool_fns = build_tools(AGENT.memory_store)
 AGENT.set_tools(_tool_schemas, _tool_fns)
 
 # Track active WebSocket connections for broadcasting status updates
@@ -87,21 +91,36 @@ async def _run_session(ws, stop_event: "threading.Event", mode: str, stt_engine:
                 send_json(ws, {"type": "level", "value": round(level, 3)}), loop
             )
 
-        pcm_bytes = await asyncio.to_thread(record_pcm_until_silence, stop_event, on_frame)
+        pcm, voiced_ms = await asyncio.to_thread(record_pcm_until_silence, stop_event, on_frame)
 
-        if len(pcm_bytes) < int(SETTINGS.sample_rate * 0.15) * 2:
+        if len(pcm) < int(SETTINGS.sample_rate * 0.15):
+            await send_json(ws, {"type": "status", "state": "idle"})
+            return
+        if voiced_ms < SETTINGS.min_voiced_ms:
+            # Almost no speech: skip the encoder pass (and any WAV dump).
+            await send_json(ws, {"type": "result", "text": ""})
             await send_json(ws, {"type": "status", "state": "idle"})
             return
 
+        if _DUMP_WAV:
+            wav_path = await asyncio.to_thread(write_pcm_to_temp_wav, pcm)
+            log(f"Dumped utterance to {wav_path}")
+
         await send_json(ws, {"type": "status", "state": "transcribing"})
         if moonshine_session is not None:
             text = await asyncio.to_thread(moonshine_session.finish)
         else:
-            text = await asyncio.to_thread(transcribe_pcm, pcm_bytes)
+            text = await asyncio.to_thread(transcribe_pcm, pcm)
 
         if mode == "assistant":
             await send_json(ws, {"type": "status", "state": "thinking"})
-            response = await asyncio.to_thread(AGENT.run, text)
+
+            def on_token(delta: str) -> None:
+                asyncio.run_coroutine_threadsafe(
+                    send_json(ws, {"type": "assistant_partial", "text": delta}), loop
+                )
+
+            response = await asyncio.to_thread(AGENT.run, text, on_token)
             await send_json(ws, {"type": "assistant_result", "text": response})
             await send_json(ws, {"type": "status", "state": "speaking"})
             await asyncio.to_thread(speak, response)
@@ -127,7 +146,7 @@ async def _run_session(ws, stop_event: "threading.Event", mode: str, stt_engine:
 async def check_llm_health() -> bool:
     """Check if LM Studio/LLM server is available."""
     try:
-        return await asyncio.to_thread(_health_check_client.check_health, timeout=3.0)
+        return await _health_check_client.check_health_async(timeout=3.0)
     except Exception:
         return False
 
@@ -137,14 +156,13 @@ async def broadcast_llm_status():
     if not _active_connections:
         return
     message = {"type": "llm_status", "available": STATE.llm_available}
-    disconnected = set()
-    for conn in _active_connections:
-        try:
-            await send_json(conn, message)
-        except Exception:
-            disconnected.add(conn)
+    # Send to everyone concurrently so one slow client can't delay the rest.
+    conns = list(_active_connections)
+    results = await asyncio.gather(*(send_json(conn, message) for conn in conns), return_exceptions=True)
     # Clean up disconnected clients
-    _active_connections.difference_update(disconnected)
+    _active_connections.difference_update(
+        conn for conn, result in zip(conns, results) if isinstance(result, Exception)
+    )
 
 
 async def _refresh_llm_status() -> None:
@@ -239,7 +257,8 @@ def _warm_up() -> None:
     """Pre-load heavy components so the first session is fast. Runs in a
     background thread; the websocket server is already accepting connections."""
     warm_up_mic()
-    warm_up_whisper()
+    if SETTINGS.whisper_warmup:
+        warm_up_whisper()
     warm_up_moonshine()
 
 
@@ -270,6 +289,10 @@ async def main() -> None:
             {"errno": getattr(e, "errno", None), "winerror": getattr(e, "winerror", None), "str": str(e)},
         )
         raise
+    finally:
+        # Commit any conversation/preference writes still queued.
+        AGENT.memory_store.flush()
+        await _health_check_client.aclose()
 
 
 if __name__ == "__main__":